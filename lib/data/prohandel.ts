@@ -6,6 +6,7 @@
  */
 import * as prohandelClient from '../mercurios/clients/prohandel-client';
 import { DateTime } from 'luxon';
+import { selectTopN } from '../utils';
 
 // Types for the abstracted data
 export interface SalesSummary {
@@ -246,10 +247,8 @@ export const getTopProductsByRevenue = async (
       return [];
     }
     
-    // Sort products by revenue and take the top ones
-    const topProducts = [...salesSummary.byProduct]
-      .sort((a, b) => b.revenue - a.revenue)
-      .slice(0, limit);
+    // Take the top products by revenue without sorting the full list
+    const topProducts = selectTopN(salesSummary.byProduct, limit, (a, b) => b.revenue - a.revenue);
     
     setCachedData(cacheKey, topProducts);
     return topProducts;
@@ -303,11 +302,12 @@ export const getStockoutRiskAssessment = async (
   if (cached) return cached;
   
   try {
-    // Get basic stockout risks from client
-    const stockoutRisks = await prohandelClient.getStockoutRisks(warehouseId, useRealData);
-    
-    // Fetch sales data to calculate average daily sales for better risk assessment
-    const last30DaysSales = await getSalesDataByWarehouse(warehouseId, '30d', useRealData);
+    // Fetch the basic stockout risks together with the sales data used to
+    // calculate average daily sales for better risk assessment
+    const [stockoutRisks, last30DaysSales] = await Promise.all([
+      prohandelClient.getStockoutRisks(warehouseId, useRealData),
+      getSalesDataByWarehouse(warehouseId, '30d', useRealData),
+    ]);
     
     // Enrich stockout risks with sales data for better risk assessment
     const enrichedRisks = enrichStockoutRisks(stockoutRisks, last30DaysSales);
@@ -377,15 +377,17 @@ export const getAIAssistantContext = async (
           growth: product.growth
         })),
         underperformers: sales30d.byProduct
-          ?.filter(product => product.growth < 0)
-          .sort((a, b) => a.growth - b.growth)
-          .slice(0, 5)
-          .map(product => ({
-            productId: product.productId,
-            name: product.name,
-            revenue: product.revenue,
-            growth: product.growth
-          })) || []
+          ? selectTopN(
+              sales30d.byProduct.filter(product => product.growth < 0),
+              5,
+              (a, b) => a.growth - b.growth
+            ).map(product => ({
+              productId: product.productId,
+              name: product.name,
+              revenue: product.revenue,
+              growth: product.growth
+            }))
+          : []
       }
     };
     
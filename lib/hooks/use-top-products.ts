@@ -1,6 +1,7 @@
 import { useQuery } from '@tanstack/react-query';
 import prohandelClient from '@/lib/mercurios/clients/prohandel-client';
 import { useTenant } from '@/lib/mercurios/tenant-context';
+import { selectTopN } from '@/lib/utils';
 
 export interface TopProduct {
   id: string;
@@ -86,43 +87,45 @@ export function useTopProducts(
             category: string;
           }>();
           
+          // Running totals, accumulated in the same pass as the per-product aggregation
+          let totalRevenue = 0;
+          let totalQuantity = 0;
+          
           // Aggregate sales by product
           salesData.data.forEach((sale: any) => {
             sale.items.forEach((item: any) => {
               const productId = item.article_id;
+              const quantity = item.quantity;
+              const revenue = item.price * quantity;
               const existingProduct = productMap.get(productId);
               
+              totalQuantity += quantity;
+              totalRevenue += revenue;
+              
               if (existingProduct) {
-                existingProduct.quantity += item.quantity;
-                existingProduct.revenue += item.price * item.quantity;
+                existingProduct.quantity += quantity;
+                existingProduct.revenue += revenue;
               } else {
                 productMap.set(productId, {
                   id: productId,
                   name: item.article_name || `Product ${productId}`,
-                  quantity: item.quantity,
-                  revenue: item.price * item.quantity,
+                  quantity,
+                  revenue,
                   category: item.category_name || 'Uncategorized',
                 });
               }
             });
           });
           
-          // Convert map to array and sort
-          let products = Array.from(productMap.values());
-          
-          // Sort by the selected metric
-          products = products.sort((a, b) => 
+          // Keep only the top products by the selected metric
+          const products = selectTopN(Array.from(productMap.values()), limit, (a, b) => 
             sortBy === 'quantity' 
               ? b.quantity - a.quantity 
               : b.revenue - a.revenue
           );
           
-          // Calculate totals
-          const totalRevenue = products.reduce((sum, product) => sum + product.revenue, 0);
-          const totalQuantity = products.reduce((sum, product) => sum + product.quantity, 0);
-          
-          // Add percentage of total and limit the results
-          const topProducts = products.slice(0, limit).map(product => ({
+          // Add percentage of total
+          const topProducts = products.map(product => ({
             ...product,
             percentageOfTotal: sortBy === 'quantity'
               ? (product.quantity / totalQuantity) * 100
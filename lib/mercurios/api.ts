@@ -68,6 +68,9 @@ const ENDPOINTS = {
   customerSegmentation: '/api/customer-segmentation',
 };
 
+// Maximum number of purchase-history requests in flight during customer segmentation
+const SEGMENTATION_CONCURRENCY = 8;
+
 // API endpoints for MCP
 const MCP_ENDPOINTS = {
   stockoutRisk: '/widgets/stockout-risk',
@@ -314,32 +317,30 @@ export const fetchInventoryAnalyticsMCP = async (params?: { period?: string; dat
     
     // Use the ProHandel client to get real inventory analytics data
     console.log(`Fetching real inventory analytics data from ProHandel for period: ${params?.period || '30 days'}`);
-    const inventoryData = await prohandelClient.getInventoryAnalytics({
-      from: fromDate.toISOString().split('T')[0],
-      to: today.toISOString().split('T')[0]
-    });
-    
-    // Get stock levels
-    const stockData = await prohandelClient.getStockLevels({ limit: 1000 });
-    
-    // Get categories
-    const categoriesData = await prohandelClient.getCategories();
-    
-    // Transform the data into the format expected by the UI
-    const totalValue = stockData.data.reduce((total, item) => {
-      return total + (item.value || 0);
-    }, 0);
+    // Analytics, stock levels and categories are independent, so fetch them together
+    const [inventoryData, stockData, categoriesData] = await Promise.all([
+      prohandelClient.getInventoryAnalytics({
+        from: fromDate.toISOString().split('T')[0],
+        to: today.toISOString().split('T')[0]
+      }),
+      prohandelClient.getStockLevels({ limit: 1000 }),
+      prohandelClient.getCategories(),
+    ]);
     
     // Calculate quarterly trends (this would need actual historical data)
     // For now, we'll generate some reasonable data
     const quarterlyTrends = [45, 15, 25, 15]; // Placeholder
     
-    // Calculate stock health and distribution
+    // Transform the data into the format expected by the UI:
+    // total value and stock health distribution in a single pass
+    let totalValue = 0;
     let lowStock = 0;
     let optimalStock = 0;
     let excessStock = 0;
     
     stockData.data.forEach((item) => {
+      totalValue += item.value || 0;
+      
       const quantity = item.quantity || 0;
       const reorderPoint = item.reorder_point || 0;
       
@@ -428,23 +429,23 @@ export const fetchSalesPerformanceMCP = async (params?: {
       comparisonFromDate.setTime(comparisonToDate.getTime() - duration);
     }
     
-    // Use the ProHandel client to get real sales data
+    // Use the ProHandel client to get real sales data, fetching the
+    // comparison period (if requested) concurrently with the current one
     console.log(`Fetching real sales data from ProHandel for period: ${params?.period || '30 days'}`);
-    const salesData = await prohandelClient.getSales({
-      from: fromDate.toISOString().split('T')[0],
-      to: today.toISOString().split('T')[0],
-      groupBy: params?.groupBy || 'day'
-    });
-    
-    // Get comparison data if requested
-    let comparisonData = null;
-    if (comparisonFromDate && comparisonToDate) {
-      comparisonData = await prohandelClient.getSales({
-        from: comparisonFromDate.toISOString().split('T')[0],
-        to: comparisonToDate.toISOString().split('T')[0],
+    const [salesData, comparisonData] = await Promise.all([
+      prohandelClient.getSales({
+        from: fromDate.toISOString().split('T')[0],
+        to: today.toISOString().split('T')[0],
         groupBy: params?.groupBy || 'day'
-      });
-    }
+      }),
+      comparisonFromDate && comparisonToDate
+        ? prohandelClient.getSales({
+            from: comparisonFromDate.toISOString().split('T')[0],
+            to: comparisonToDate.toISOString().split('T')[0],
+            groupBy: params?.groupBy || 'day'
+          })
+        : null
+    ]);
     
     // Transform the data as needed
     // For this example, we'll just return the raw data
@@ -494,33 +495,39 @@ export const fetchCustomerSegmentationMCP = async (params?: {
       vip: []
     };
     
+    // Fetch purchase histories concurrently - each customer is independent,
+    // so we only cap the number of requests in flight
+    const purchaseHistories = await mapWithConcurrency(
+      customersData.data,
+      SEGMENTATION_CONCURRENCY,
+      customer => prohandelClient.getCustomerPurchaseHistory(customer.id, { limit: 100 })
+    );
+
+    // Reference time shared by every customer in this run
+    const now = Date.now();
+    
     // Process each customer
-    for (const customer of customersData.data) {
-      // Get purchase history
-      const purchaseHistory = await prohandelClient.getCustomerPurchaseHistory(
-        customer.id, 
-        { limit: 100 }
-      );
-      
+    for (let i = 0; i < customersData.data.length; i++) {
+      const customer = customersData.data[i];
+      const purchaseHistory = purchaseHistories[i];
+
       const purchases = purchaseHistory.data || [];
       const totalPurchases = purchases.length;
       let totalSpent = 0;
+      let mostRecentPurchaseTime = 0;
       
-      // Calculate total spent
-      purchases.forEach(purchase => {
+      // Calculate total spent and the most recent purchase date in a single pass
+      for (const purchase of purchases) {
         totalSpent += purchase.total || 0;
-      });
-      
-      // Determine most recent purchase date
-      let mostRecentPurchaseDate = new Date(0);
-      if (purchases.length > 0) {
-        const purchaseDates = purchases.map(p => new Date(p.date));
-        mostRecentPurchaseDate = new Date(Math.max(...purchaseDates.map(d => d.getTime())));
+        
+        const purchaseTime = new Date(purchase.date).getTime();
+        if (purchaseTime > mostRecentPurchaseTime) {
+          mostRecentPurchaseTime = purchaseTime;
+        }
       }
       
       // Segment the customer
-      const today = new Date();
-      const daysSinceLastPurchase = Math.floor((today.getTime() - mostRecentPurchaseDate.getTime()) / (1000 * 60 * 60 * 24));
+      const daysSinceLastPurchase = Math.floor((now - mostRecentPurchaseTime) / (1000 * 60 * 60 * 24));
       
       // Enriched customer object with segmentation data
       const enrichedCustomer = {
@@ -622,6 +629,34 @@ const convertParams = <T>(params?: Record<string, any>): T | undefined => {
   return params as unknown as T;
 };
 
+// Helper function to run async calls over a list with a bounded number in flight.
+// Results are returned in the same order as the input items. After the first
+// failure no further items are started, since the whole result is discarded.
+const mapWithConcurrency = async <T, R>(
+  items: T[],
+  limit: number,
+  fn: (item: T) => Promise<R>
+): Promise<R[]> => {
+  const results: R[] = new Array(items.length);
+  let nextIndex = 0;
+  let failed = false;
+
+  const worker = async () => {
+    while (!failed && nextIndex < items.length) {
+      const index = nextIndex++;
+      try {
+        results[index] = await fn(items[index]);
+      } catch (error) {
+        failed = true;
+        throw error;
+      }
+    }
+  };
+
+  await Promise.all(Array.from({ length: Math.min(limit, items.length) }, worker));
+  return results;
+};
+
 // Helper function to get mock data for development
 const getMockData = <T>(endpoint: string): Promise<T> => {
   // Return appropriate mock data based on the endpoint
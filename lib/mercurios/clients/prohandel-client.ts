@@ -7,6 +7,7 @@
 
 import Cookies from 'js-cookie';
 import * as mockData from '../../mock/prohandel-mock';
+import { getCachedValue, setCachedValue, invalidateCache, fetchWithCache, waitForRedis } from '../../utils/cacheUtils';
 
 // Configuration for ProHandel API - values from environment variables with fallbacks
 // Based on the known working configuration from API testing
@@ -14,7 +15,9 @@ const PROHANDEL_CONFIG = {
   AUTH_URL: process.env.PROHANDEL_AUTH_URL || 'https://auth.prohandel.cloud/api/v4',
   API_KEY: process.env.PROHANDEL_API_KEY,
   API_SECRET: process.env.PROHANDEL_API_SECRET,
-  TENANT_ID: process.env.TENANT_ID
+  TENANT_ID: process.env.TENANT_ID,
+  // Abort requests that stall instead of blocking the caller indefinitely
+  REQUEST_TIMEOUT_MS: Number(process.env.PROHANDEL_REQUEST_TIMEOUT_MS) || 10000
 };
 
 // Response type for authentication - handles the different response formats
@@ -48,6 +51,57 @@ let tokenCache: {
   retryCount: 0
 };
 
+// Shared cache key for the session so other server instances can reuse it.
+// Only used while Redis is connected; the module-level tokenCache covers the rest.
+const TOKEN_CACHE_KEY = `prohandel:auth:${PROHANDEL_CONFIG.TENANT_ID || 'default'}`;
+
+// Start connecting to Redis when the module loads so the shared caches are
+// usable by the first request on a fresh instance
+if (typeof window === 'undefined') {
+  void waitForRedis(0);
+}
+
+/**
+ * Store a freshly issued token locally and in the shared cache
+ * @param token Access token
+ * @param serverUrl Server URL returned by the auth endpoint
+ * @param expiresAt Epoch milliseconds after which the token must be refreshed
+ */
+const storeToken = async (token: string, serverUrl: string, expiresAt: number): Promise<void> => {
+  tokenCache = { token, expiresAt, serverUrl, retryCount: 0 };
+
+  const ttlSeconds = Math.floor((expiresAt - Date.now()) / 1000);
+  if (ttlSeconds > 0 && await waitForRedis()) {
+    await setCachedValue(TOKEN_CACHE_KEY, { token, serverUrl, expiresAt }, ttlSeconds);
+  }
+};
+
+// Token extractors for the response formats the auth endpoints are known to return,
+// tried in order until one matches
+const TOKEN_EXTRACTORS: Array<(auth: any) => { token: string; serverUrl: string } | null> = [
+  auth => auth.token?.token?.value ? { token: auth.token.token.value, serverUrl: auth.serverUrl } : null,
+  auth => auth.token?.value ? { token: auth.token.value, serverUrl: auth.serverUrl } : null,
+  auth => auth.access_token
+    ? { token: auth.access_token, serverUrl: auth.serverUrl || 'https://linde.prohandel.de/api/v2' }
+    : null,
+];
+
+/**
+ * Extract the token and server URL from an authentication response
+ * @param auth Parsed authentication response
+ * @returns Token and server URL, or null if the format is not recognised
+ */
+const extractToken = (auth: any): { token: string; serverUrl: string } | null => {
+  for (const extract of TOKEN_EXTRACTORS) {
+    const result = extract(auth);
+    if (result) return result;
+  }
+  return null;
+};
+
+// Authentication currently in flight, shared by concurrent callers
+let pendingAuth: Promise<{ token: string; serverUrl: string }> | null = null;
+
 /**
  * Authenticate with the ProHandel API
  * 
@@ -59,13 +113,66 @@ let tokenCache: {
  * @returns Access token and server URL
  */
 export const authenticate = async (): Promise<{ token: string; serverUrl: string }> => {
+  // Return cached token if it's still valid
+  if (tokenCache.token && tokenCache.expiresAt && tokenCache.serverUrl && tokenCache.expiresAt > Date.now()) {
+    console.log('Using cached ProHandel token');
+    return { token: tokenCache.token, serverUrl: tokenCache.serverUrl };
+  }
+
+  // Requests that find the token expired at the same time wait on a single
+  // authentication instead of each posting to the auth endpoint
+  if (!pendingAuth) {
+    pendingAuth = requestToken().finally(() => {
+      pendingAuth = null;
+    });
+  }
+
+  return pendingAuth;
+};
+
+/**
+ * POST the API credentials to a ProHandel auth endpoint
+ * @param url Auth endpoint URL
+ * @returns Parsed authentication response
+ */
+const postCredentials = async (url: string): Promise<any> => {
+  const response = await fetch(url, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({
+      ApiKey: PROHANDEL_CONFIG.API_KEY,
+      Secret: PROHANDEL_CONFIG.API_SECRET,
+      TenantId: PROHANDEL_CONFIG.TENANT_ID
+    }),
+    signal: AbortSignal.timeout(PROHANDEL_CONFIG.REQUEST_TIMEOUT_MS),
+  });
+
+  if (!response.ok) {
+    const errorText = await response.text();
+    throw new Error(`Authentication failed: ${response.status} ${errorText}`);
+  }
+
+  return response.json();
+};
+
+/**
+ * Obtain a token from the shared cache or the ProHandel auth endpoint
+ * @returns Access token and server URL
+ */
+const requestToken = async (): Promise<{ token: string; serverUrl: string }> => {
   try {
     const now = Date.now();
 
-    // Return cached token if it's still valid
-    if (tokenCache.token && tokenCache.expiresAt && tokenCache.serverUrl && tokenCache.expiresAt > now) {
-      console.log('Using cached ProHandel token');
-      return { token: tokenCache.token, serverUrl: tokenCache.serverUrl };
+    // Reuse a token issued to another instance before hitting the auth endpoint
+    const shared = await waitForRedis()
+      ? await getCachedValue<{ token: string; serverUrl: string; expiresAt: number }>(TOKEN_CACHE_KEY)
+      : null;
+    if (shared && shared.expiresAt > now) {
+      console.log('Using shared cached ProHandel token');
+      tokenCache = { ...shared, retryCount: 0 };
+      return { token: shared.token, serverUrl: shared.serverUrl };
     }
 
     console.log('Authenticating with ProHandel API...');
@@ -79,24 +186,7 @@ export const authenticate = async (): Promise<{ token: string; serverUrl: string
     
     // Try the primary auth URL first
     try {
-      const response = await fetch(authUrl, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          ApiKey: PROHANDEL_CONFIG.API_KEY,
-          Secret: PROHANDEL_CONFIG.API_SECRET,
-          TenantId: PROHANDEL_CONFIG.TENANT_ID
-        }),
-      });
-      
-      if (!response.ok) {
-        const errorText = await response.text();
-        throw new Error(`Authentication failed: ${response.status} ${errorText}`);
-      }
-
-      const auth: AuthResponse = await response.json();
+      const auth: AuthResponse = await postCredentials(authUrl);
       
       // Extract token from the nested response format
       if (!auth.token || !auth.token.token || !auth.token.token.value) {
@@ -107,12 +197,7 @@ export const authenticate = async (): Promise<{ token: string; serverUrl: string
       const serverUrl = auth.serverUrl;
       
       // Cache the token with expiration time (subtracting 1 minute for safety)
-      tokenCache = {
-        token,
-        expiresAt: now + (auth.token.token.expiresIn * 1000) - 60000,
-        serverUrl,
-        retryCount: 0
-      };
+      await storeToken(token, serverUrl, now + (auth.token.token.expiresIn * 1000) - 60000);
       
       console.log('Authentication successful! Token obtained from primary auth URL.');
       return { token, serverUrl };
@@ -126,50 +211,16 @@ export const authenticate = async (): Promise<{ token: string; serverUrl: string
         tokenCache.retryCount++;
         
         try {
-          const response = await fetch(alternativeUrl, {
-            method: 'POST',
-            headers: {
-              'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-              ApiKey: PROHANDEL_CONFIG.API_KEY,
-              Secret: PROHANDEL_CONFIG.API_SECRET,
-              TenantId: PROHANDEL_CONFIG.TENANT_ID
-            }),
-          });
-          
-          if (!response.ok) {
-            throw new Error(`Alternative auth failed: ${response.status}`);
-          }
-
-          const auth = await response.json();
-          
-          // Check different potential response formats
-          let token = null;
-          let serverUrl = null;
+          const auth = await postCredentials(alternativeUrl);
           
-          if (auth.token?.token?.value) {
-            token = auth.token.token.value;
-            serverUrl = auth.serverUrl;
-          } else if (auth.token?.value) {
-            token = auth.token.value;
-            serverUrl = auth.serverUrl;
-          } else if (auth.access_token) {
-            token = auth.access_token;
-            serverUrl = auth.serverUrl || 'https://linde.prohandel.de/api/v2';
-          }
-          
-          if (!token) {
+          const extracted = extractToken(auth);
+          if (!extracted) {
             throw new Error('Could not extract token from authentication response');
           }
+          const { token, serverUrl } = extracted;
           
           // Cache the token with a default expiration of 30 minutes if not specified
-          tokenCache = {
-            token,
-            expiresAt: now + ((auth.token?.token?.expiresIn || 1800) * 1000) - 60000,
-            serverUrl,
-            retryCount: 0 // Reset retry count on success
-          };
+          await storeToken(token, serverUrl, now + ((auth.token?.token?.expiresIn || 1800) * 1000) - 60000);
           
           console.log('Authentication successful with alternative auth URL!');
           return { token, serverUrl };
@@ -188,8 +239,31 @@ export const authenticate = async (): Promise<{ token: string; serverUrl: string
   }
 };
 
+// Cache TTLs (in seconds) for GET responses, matched by endpoint prefix.
+// `ttl` is how long a response is served as fresh; `staleTtl` is how long it is
+// kept as a last-known-good fallback for when the API is failing.
+// Master data changes rarely; sales and stock figures move throughout the day,
+// so their fallback window stays short. Endpoints not listed here are never cached.
+const ENDPOINT_CACHE_POLICY: Array<[string, { ttl: number; staleTtl: number }]> = [
+  ['/branch', { ttl: 60 * 60, staleTtl: 12 * 60 * 60 }],
+  ['/article', { ttl: 60 * 60, staleTtl: 12 * 60 * 60 }],
+  ['/stockout-risk', { ttl: 60, staleTtl: 5 * 60 }],
+  ['/sales', { ttl: 30, staleTtl: 5 * 60 }],
+];
+
+// Headers sent with every API request; only Authorization varies per call
+const BASE_HEADERS: Record<string, string> = {
+  'X-Tenant-ID': PROHANDEL_CONFIG.TENANT_ID as string,
+  'Content-Type': 'application/json',
+  'Accept': 'application/json',
+  'X-API-Version': 'v2.29.1', // Include API version for better compatibility
+};
+
+const getCachePolicy = (endpoint: string): { ttl: number; staleTtl: number } | undefined =>
+  ENDPOINT_CACHE_POLICY.find(([prefix]) => endpoint.startsWith(prefix))?.[1];
+
 /**
- * Generic API client for ProHandel API
+ * Perform a request against the ProHandel API
  * 
  * Key points about the ProHandel API:
  * 1. The base URL comes from the serverUrl in the authentication response
@@ -200,7 +274,7 @@ export const authenticate = async (): Promise<{ token: string; serverUrl: string
  * @param options Request options
  * @returns Response data
  */
-const apiClient = async <T>(
+const requestProHandel = async <T>(
   endpoint: string,
   options: RequestInit = {}
 ): Promise<T> => {
@@ -213,11 +287,8 @@ const apiClient = async <T>(
     
     // Set the required headers
     const headers: HeadersInit = {
+      ...BASE_HEADERS,
       'Authorization': `Bearer ${token}`,
-      'X-Tenant-ID': PROHANDEL_CONFIG.TENANT_ID as string,
-      'Content-Type': 'application/json',
-      'Accept': 'application/json',
-      'X-API-Version': 'v2.29.1', // Include API version for better compatibility
       ...(options.headers || {}),
     };
 
@@ -226,16 +297,32 @@ const apiClient = async <T>(
       headers,
     };
 
+    // Each attempt gets its own timeout unless the caller supplied a signal
+    const withTimeout = (init: RequestInit): RequestInit => ({
+      ...init,
+      signal: options.signal ?? AbortSignal.timeout(PROHANDEL_CONFIG.REQUEST_TIMEOUT_MS),
+    });
+
     console.log(`ProHandel API request to: ${url}`);
-    const response = await fetch(url, config);
+    const response = await fetch(url, withTimeout(config));
 
     // Handle common error scenarios
     if (!response.ok) {
       // If unauthorized, try refreshing the token
       if (response.status === 401) {
-        // Clear token cache to force re-authentication
-        tokenCache.token = null;
-        tokenCache.expiresAt = null;
+        // Clear the token to force re-authentication, unless a concurrent
+        // request has already replaced the one this request was sent with
+        if (tokenCache.token === token) {
+          tokenCache.token = null;
+          tokenCache.expiresAt = null;
+          
+          if (await waitForRedis()) {
+            const shared = await getCachedValue<{ token: string }>(TOKEN_CACHE_KEY);
+            if (shared?.token === token) {
+              await invalidateCache(TOKEN_CACHE_KEY);
+            }
+          }
+        }
         
         // Retry the request once with a fresh token
         const { token: newToken } = await authenticate();
@@ -249,7 +336,7 @@ const apiClient = async <T>(
         };
         
         console.log('Retrying request with fresh token...');
-        const retryResponse = await fetch(url, retryConfig);
+        const retryResponse = await fetch(url, withTimeout(retryConfig));
         
         if (!retryResponse.ok) {
           const errorText = await retryResponse.text();
@@ -271,6 +358,49 @@ const apiClient = async <T>(
   }
 };
 
+/**
+ * Generic API client for ProHandel API
+ * 
+ * When Redis is connected, GET requests to endpoints listed in
+ * ENDPOINT_CACHE_POLICY are served from the cache while fresh. If the live
+ * request fails, the last successful response is returned instead of the error
+ * for as long as that endpoint's stale window allows.
+ * 
+ * @param endpoint API endpoint path
+ * @param options Request options
+ * @returns Response data
+ */
+const apiClient = async <T>(
+  endpoint: string,
+  options: RequestInit = {}
+): Promise<T> => {
+  const policy = getCachePolicy(endpoint);
+  const method = (options.method || 'GET').toUpperCase();
+
+  // Only cache through a live Redis connection; otherwise go straight to the API
+  if (method !== 'GET' || !policy || !(await waitForRedis())) {
+    return requestProHandel<T>(endpoint, options);
+  }
+
+  const cacheKey = `prohandel:api:${PROHANDEL_CONFIG.TENANT_ID || 'default'}:${endpoint}`;
+  const staleKey = `${cacheKey}:stale`;
+
+  try {
+    return await fetchWithCache(async () => {
+      const data = await requestProHandel<T>(endpoint, options);
+      await setCachedValue(staleKey, data, policy.staleTtl);
+      return data;
+    }, cacheKey, policy.ttl);
+  } catch (error: any) {
+    const stale = await getCachedValue<T>(staleKey);
+    if (stale) {
+      console.warn(`ProHandel API request failed, serving stale response for ${endpoint}`);
+      return stale;
+    }
+    throw error;
+  }
+};
+
 /**
  * Get all warehouses/locations
  * 
@@ -21,3 +21,37 @@ export function formatCurrency(amount: number, compact = false): string {
   
   return formatter.format(amount);
 }
+
+/**
+ * Select the first `n` items in `compare` order without sorting the whole list
+ * @param items - The items to select from
+ * @param n - The number of items to keep
+ * @param compare - Comparator with the same semantics as Array.prototype.sort
+ * @returns The top `n` items in sorted order (stable for ties)
+ */
+export function selectTopN<T>(items: T[], n: number, compare: (a: T, b: T) => number): T[] {
+  const top: T[] = [];
+  if (n <= 0) return top;
+  
+  for (const item of items) {
+    // Skip anything that can't displace the current last place
+    if (top.length === n && compare(item, top[n - 1]) >= 0) continue;
+    
+    // Binary search for the insertion point, after any equal items
+    let lo = 0;
+    let hi = top.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (compare(item, top[mid]) < 0) {
+        hi = mid;
+      } else {
+        lo = mid + 1;
+      }
+    }
+    
+    top.splice(lo, 0, item);
+    if (top.length > n) top.pop();
+  }
+  
+  return top;
+}
@@ -23,6 +23,9 @@ const DEFAULT_TTL = {
 // Initialize Redis client with connection retry logic
 let redisClient: any = null;
 
+// Settles once the first connection attempt has either succeeded or failed
+let initialConnect: Promise<void> | null = null;
+
 const getRedisClient = (): any => {
   // Only initialize Redis on the server side
   if (typeof window !== 'undefined') {
@@ -34,11 +37,27 @@ const getRedisClient = (): any => {
       redisClient = new Redis(REDIS_URL, {
         password: REDIS_PASSWORD,
         retryStrategy: (times: number) => {
-          // Exponential backoff up to 30 seconds
-          const delay = Math.min(times * 100, 30000);
-          return delay;
+          // Exponential backoff capped at 30 seconds, with full jitter so
+          // instances that lost the connection together don't reconnect in lockstep
+          const delay = Math.random() * Math.min(100 * 2 ** times, 30000);
+          return Math.round(delay);
         },
         maxRetriesPerRequest: 3,
+        // Queue commands during the initial connect (switched off once ready, see
+        // below) and cap how long any command, queued or sent, can take
+        enableOfflineQueue: true,
+        commandTimeout: 1000,
+      });
+      
+      // After the first successful connect, fail commands straight away while
+      // disconnected instead of queueing them across reconnect attempts
+      redisClient.once('ready', () => {
+        redisClient.options.enableOfflineQueue = false;
+      });
+      
+      initialConnect = new Promise<void>(resolve => {
+        redisClient.once('ready', resolve);
+        redisClient.once('error', resolve);
       });
       
       redisClient.on('error', (err: Error) => {
@@ -60,9 +79,57 @@ const getRedisClient = (): any => {
   return redisClient;
 };
 
+/**
+ * Waits a bounded time for the initial Redis connection, so a freshly started
+ * instance doesn't mistake "still connecting" for "no Redis"
+ * @param timeoutMs Maximum time to wait for the first connect
+ * @returns True when cache calls will be answered by Redis
+ */
+export const waitForRedis = async (timeoutMs: number = 200): Promise<boolean> => {
+  const redis = getRedisClient();
+  if (!redis) return false;
+  
+  if (redis.status !== 'ready' && initialConnect) {
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    await Promise.race([
+      initialConnect,
+      new Promise<void>(resolve => {
+        timer = setTimeout(resolve, timeoutMs);
+      }),
+    ]);
+    clearTimeout(timer);
+  }
+  
+  return redis.status === 'ready';
+};
+
 // In-memory fallback cache when Redis is unavailable
 const memoryCache: Record<string, { value: any; expires: number }> = {};
 
+// Upper bound on in-memory entries so distinct keys can't grow it without limit
+const MEMORY_CACHE_MAX_ENTRIES = 500;
+
+/**
+ * Drops expired in-memory entries, then the oldest ones until there is room for a new entry
+ */
+const pruneMemoryCache = (): void => {
+  const now = Date.now();
+  const keys = Object.keys(memoryCache);
+  
+  keys.forEach(key => {
+    if (memoryCache[key].expires <= now) {
+      delete memoryCache[key];
+    }
+  });
+  
+  // Keys keep insertion order, so the first ones are the oldest writes
+  const remaining = Object.keys(memoryCache);
+  const excess = remaining.length - MEMORY_CACHE_MAX_ENTRIES + 1;
+  for (let i = 0; i < excess; i++) {
+    delete memoryCache[remaining[i]];
+  }
+};
+
 /**
  * Gets a value from cache (Redis or in-memory fallback)
  * @param key Cache key
@@ -87,6 +154,9 @@ export const getCachedValue = async <T>(key: string): Promise<T | null> => {
       if (cacheItem && cacheItem.expires > now) {
         return cacheItem.value;
       }
+      if (cacheItem) {
+        delete memoryCache[fullKey];
+      }
     }
   } catch (error) {
     console.error(`Cache get error for key ${fullKey}:`, error);
@@ -119,7 +189,11 @@ export const setCachedValue = async <T>(
         ttlSeconds
       );
     } else {
-      // Fall back to in-memory cache
+      // Fall back to in-memory cache, re-inserting so the key counts as newest
+      delete memoryCache[fullKey];
+      if (Object.keys(memoryCache).length >= MEMORY_CACHE_MAX_ENTRIES) {
+        pruneMemoryCache();
+      }
       memoryCache[fullKey] = {
         value,
         expires: Date.now() + (ttlSeconds * 1000)
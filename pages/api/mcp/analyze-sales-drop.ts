@@ -7,6 +7,9 @@ const MCP_API_URL = process.env.NEXT_PUBLIC_MCP_API_URL || 'https://mcp.mercurio
 const OPENAI_API_KEY = process.env.OPENAI_API_KEY;
 const TENANT_ID = process.env.TENANT_ID;
 
+// The output schema never changes, so build it once rather than per request
+const OUTPUT_SCHEMA = generateOutputSchema();
+
 /**
  * API route handler for sales drop analysis
  * 
@@ -63,7 +66,7 @@ export default async function handler(
           system_prompt: systemPrompt,
           context: enrichedContext,
           tools: ["sales_data_analysis", "product_performance_analysis"],
-          output_schema: generateOutputSchema()
+          output_schema: OUTPUT_SCHEMA
         };
         
         // Call the MCP API
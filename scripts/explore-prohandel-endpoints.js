@@ -1,6 +1,10 @@
 // Script to explore ProHandel API endpoints for finding warehouses/locations
 require('dotenv').config({ path: '.env.local' });
 const fetch = require('node-fetch');
+const https = require('https');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
 
 // Configuration
 const config = {
@@ -10,10 +14,64 @@ const config = {
   TENANT_ID: process.env.TENANT_ID
 };
 
+// Number of endpoint probes in flight at once, low enough to avoid rate limiting
+const PROBE_CONCURRENCY = 4;
+
+// Reuse TLS connections across probes instead of a new handshake per request
+const keepAliveAgent = new https.Agent({ keepAlive: true, maxSockets: PROBE_CONCURRENCY });
+const agentFor = url => (url.protocol === 'https:' ? keepAliveAgent : undefined);
+
+// Token cache so repeated runs skip authentication while the token is valid
+const TOKEN_CACHE_FILE = path.join(
+  process.env.XDG_CACHE_HOME || path.join(os.homedir(), '.cache'),
+  'prohandel_token.json'
+);
+
 console.log('=== ProHandel API Endpoint Explorer ===');
 
+function readCachedToken() {
+  try {
+    const cached = JSON.parse(fs.readFileSync(TOKEN_CACHE_FILE, 'utf8'));
+    if (cached.tenantId === config.TENANT_ID && cached.expiresAt > Date.now()) {
+      return cached;
+    }
+  } catch (error) {
+    // Missing or unreadable cache, authenticate normally
+  }
+  return null;
+}
+
+function writeCachedToken(token, serverUrl, expiresIn) {
+  try {
+    fs.mkdirSync(path.dirname(TOKEN_CACHE_FILE), { recursive: true });
+    fs.writeFileSync(TOKEN_CACHE_FILE, JSON.stringify({
+      token,
+      serverUrl,
+      tenantId: config.TENANT_ID,
+      expiresAt: Date.now() + (expiresIn - 30) * 1000
+    }), { mode: 0o600 });
+  } catch (error) {
+    console.warn('Could not write token cache:', error.message);
+  }
+}
+
+function clearCachedToken() {
+  try {
+    fs.unlinkSync(TOKEN_CACHE_FILE);
+  } catch (error) {
+    // Nothing cached
+  }
+}
+
 // Authenticate and get server URL
 async function authenticate() {
+  const cached = readCachedToken();
+  if (cached) {
+    console.log('Using cached token from', TOKEN_CACHE_FILE);
+    console.log('Server URL:', cached.serverUrl);
+    return { token: cached.token, serverUrl: cached.serverUrl, fromCache: true };
+  }
+  
   try {
     console.log('Authenticating with ProHandel API...');
     const authUrl = `${config.AUTH_URL}/token`;
@@ -41,18 +99,23 @@ async function authenticate() {
     console.log('Authentication successful!');
     console.log('Server URL:', serverUrl);
     
-    return { token, serverUrl };
+    writeCachedToken(token, serverUrl, authData.token.token.expiresIn || 1800);
+    
+    return { token, serverUrl, fromCache: false };
   } catch (error) {
     console.error('Authentication error:', error.message);
     return { token: null, serverUrl: null };
   }
 }
 
-// Try to access an endpoint
-async function tryEndpoint(token, serverUrl, endpoint) {
+// Try to access an endpoint, collecting log lines so concurrent probes can be printed in order
+async function tryEndpoint(token, apiBaseUrl, endpoint) {
+  const lines = [];
+  const log = (...args) => lines.push({ level: 'log', args });
+  
   try {
-    const url = `${serverUrl}/api/v2${endpoint}`;
-    console.log(`Testing endpoint: ${url}`);
+    const url = `${apiBaseUrl}${endpoint}`;
+    log(`Testing endpoint: ${url}`);
     
     const response = await fetch(url, {
       method: 'GET',
@@ -60,35 +123,41 @@ async function tryEndpoint(token, serverUrl, endpoint) {
         'Authorization': `Bearer ${token}`,
         'X-Tenant-ID': config.TENANT_ID,
         'Content-Type': 'application/json',
-      }
+      },
+      agent: agentFor
     });
     
-    console.log(`Status: ${response.status} ${response.statusText}`);
+    log(`Status: ${response.status} ${response.statusText}`);
     
     if (response.ok) {
       try {
         const data = await response.json();
-        console.log('Response data structure:', Object.keys(data));
+        log('Response data structure:', Object.keys(data));
         if (Array.isArray(data)) {
-          console.log(`Found ${data.length} items`);
+          log(`Found ${data.length} items`);
           if (data.length > 0) {
-            console.log('First item properties:', Object.keys(data[0]));
+            log('First item properties:', Object.keys(data[0]));
           }
         }
-        return { success: true, data };
+        return { success: true, data, lines };
       } catch (e) {
-        console.log('Could not parse JSON response');
-        return { success: true, data: await response.text() };
+        log('Could not parse JSON response');
+        return { success: true, data: await response.text(), lines };
       }
     } else {
-      return { success: false };
+      return { success: false, unauthorized: response.status === 401, lines };
     }
   } catch (error) {
-    console.error(`Error with endpoint ${endpoint}:`, error.message);
-    return { success: false };
+    lines.push({ level: 'error', args: [`Error with endpoint ${endpoint}:`, error.message] });
+    return { success: false, lines };
   }
 }
 
+// Print the log lines collected by tryEndpoint
+function printLines(lines) {
+  lines.forEach(({ level, args }) => console[level](...args));
+}
+
 // List of potential store/warehouse related endpoints to try
 const potentialEndpoints = [
   '/locations',
@@ -141,19 +210,60 @@ const potentialEndpoints = [
 async function exploreEndpoints() {
   try {
     // First authenticate
-    const { token, serverUrl } = await authenticate();
+    const { token, serverUrl, fromCache } = await authenticate();
     if (!token || !serverUrl) {
       console.log('❌ Authentication failed. Cannot explore endpoints.');
       return;
     }
     
+    const apiBaseUrl = `${serverUrl}/api/v2`;
+    let currentToken = token;
+    let refreshing = null;
+    
+    // A cached token may have been revoked before it expired: drop it and
+    // authenticate once, sharing the new token between all probes
+    const refreshToken = () => {
+      if (!refreshing) {
+        console.log('Cached token rejected, re-authenticating...');
+        clearCachedToken();
+        refreshing = authenticate().then(auth => {
+          if (auth.token) currentToken = auth.token;
+          return auth.token;
+        });
+      }
+      return refreshing;
+    };
+    
     console.log('\nExploring possible warehouse/location endpoints...');
     
-    const results = [];
+    // Probe the endpoints with a few requests in flight at once. Each probe
+    // buffers its output, which is printed per endpoint in list order afterwards.
+    const outcomes = new Array(potentialEndpoints.length);
+    let nextIndex = 0;
+    
+    const worker = async () => {
+      while (nextIndex < potentialEndpoints.length) {
+        const index = nextIndex++;
+        const endpoint = potentialEndpoints[index];
+        let result = await tryEndpoint(currentToken, apiBaseUrl, endpoint);
+        
+        if (result.unauthorized && fromCache && await refreshToken()) {
+          const retry = await tryEndpoint(currentToken, apiBaseUrl, endpoint);
+          result = { ...retry, lines: [...result.lines, ...retry.lines] };
+        }
+        
+        outcomes[index] = result;
+      }
+    };
+    
+    await Promise.all(Array.from({ length: PROBE_CONCURRENCY }, worker));
     
-    // Try each endpoint
-    for (const endpoint of potentialEndpoints) {
-      const result = await tryEndpoint(token, serverUrl, endpoint);
+    const results = [];
+    outcomes.forEach((result, index) => {
+      const endpoint = potentialEndpoints[index];
+      
+      console.log('');
+      printLines(result.lines);
       
       if (result.success) {
         console.log(`✅ Found working endpoint: ${endpoint}`);
@@ -164,14 +274,12 @@ async function exploreEndpoints() {
       } else {
         console.log(`❌ Endpoint not found: ${endpoint}`);
       }
-      
-      // Add a small delay between requests to avoid rate limiting
-      await new Promise(resolve => setTimeout(resolve, 500));
-    }
+    });
     
     // Try to discover endpoints by fetching a known entity and checking its fields
     console.log('\nExamining article data for location references...');
-    const articleResult = await tryEndpoint(token, serverUrl, '/article?PageSize=1');
+    const articleResult = await tryEndpoint(currentToken, apiBaseUrl, '/article?PageSize=1');
+    printLines(articleResult.lines);
     if (articleResult.success && Array.isArray(articleResult.data) && articleResult.data.length > 0) {
       const article = articleResult.data[0];
       
@@ -209,6 +317,8 @@ async function exploreEndpoints() {
     }
   } catch (error) {
     console.error('Exploration failed:', error);
+  } finally {
+    keepAliveAgent.destroy();
   }
 }
 
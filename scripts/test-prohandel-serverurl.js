@@ -11,6 +11,9 @@ const config = {
   TENANT_ID: process.env.TENANT_ID
 };
 
+// Number of endpoint probes in flight at once
+const PROBE_CONCURRENCY = 6;
+
 console.log('=== ProHandel API ServerUrl Test ===');
 
 // Authenticate using v4 endpoint
@@ -77,55 +80,92 @@ async function testEndpoints(token, serverUrl) {
   
   console.log('\nTesting API endpoints with different base URLs...');
   
-  const successfulEndpoints = [];
-  
+  const probes = [];
   for (const baseUrl of baseUrls) {
     if (!baseUrl) continue;
+    for (const endpoint of endpoints) {
+      probes.push({ baseUrl, endpoint });
+    }
+  }
+  
+  // Probe every combination with a bounded number of requests in flight.
+  // Each probe buffers its log lines so the output stays in the original order.
+  const outcomes = new Array(probes.length);
+  let nextIndex = 0;
+  
+  const worker = async () => {
+    while (nextIndex < probes.length) {
+      const index = nextIndex++;
+      outcomes[index] = await probeEndpoint(token, probes[index].baseUrl, probes[index].endpoint);
+    }
+  };
+  
+  await Promise.all(Array.from({ length: PROBE_CONCURRENCY }, worker));
+  
+  const successfulEndpoints = [];
+  let currentBaseUrl = null;
+  
+  outcomes.forEach((outcome, index) => {
+    const { baseUrl, endpoint } = probes[index];
     
-    console.log(`\n--- Testing base URL: ${baseUrl} ---`);
+    if (baseUrl !== currentBaseUrl) {
+      console.log(`\n--- Testing base URL: ${baseUrl} ---`);
+      currentBaseUrl = baseUrl;
+    }
     
-    for (const endpoint of endpoints) {
-      try {
-        const url = `${baseUrl}${endpoint}`;
-        console.log(`\nTrying: ${url}`);
-        
-        const response = await fetch(url, {
-          method: 'GET',
-          headers: {
-            'Authorization': `Bearer ${token}`,
-            'Content-Type': 'application/json',
-            'X-Tenant-ID': config.TENANT_ID
-          }
-        });
-        
-        console.log('Response status:', response.status, response.statusText);
-        
-        if (response.ok) {
-          console.log('✅ Endpoint works!');
-          const data = await response.json();
-          console.log('Response sample:', JSON.stringify(data).substring(0, 200) + '...');
-          
-          successfulEndpoints.push({
-            url,
-            endpoint,
-            baseUrl
-          });
-        } else {
-          if (response.status === 401) {
-            console.log('❌ Authentication issue with this endpoint');
-          } else if (response.status === 404) {
-            console.log('❌ Endpoint not found');
-          } else {
-            console.log(`❌ Failed with status ${response.status}`);
-          }
-        }
-      } catch (error) {
-        console.log(`Error with ${baseUrl}${endpoint}:`, error.message);
+    outcome.lines.forEach(line => console.log(...line));
+    
+    if (outcome.success) {
+      successfulEndpoints.push({
+        url: `${baseUrl}${endpoint}`,
+        endpoint,
+        baseUrl
+      });
+    }
+  });
+  
+  return successfulEndpoints;
+}
+
+// Probe a single base URL + endpoint combination, collecting log lines for later output
+async function probeEndpoint(token, baseUrl, endpoint) {
+  const lines = [];
+  const log = (...args) => lines.push(args);
+  
+  try {
+    const url = `${baseUrl}${endpoint}`;
+    log(`\nTrying: ${url}`);
+    
+    const response = await fetch(url, {
+      method: 'GET',
+      headers: {
+        'Authorization': `Bearer ${token}`,
+        'Content-Type': 'application/json',
+        'X-Tenant-ID': config.TENANT_ID
       }
+    });
+    
+    log('Response status:', response.status, response.statusText);
+    
+    if (response.ok) {
+      log('✅ Endpoint works!');
+      const data = await response.json();
+      log('Response sample:', JSON.stringify(data).substring(0, 200) + '...');
+      return { success: true, lines };
     }
+    
+    if (response.status === 401) {
+      log('❌ Authentication issue with this endpoint');
+    } else if (response.status === 404) {
+      log('❌ Endpoint not found');
+    } else {
+      log(`❌ Failed with status ${response.status}`);
+    }
+  } catch (error) {
+    log(`Error with ${baseUrl}${endpoint}:`, error.message);
   }
   
-  return successfulEndpoints;
+  return { success: false, lines };
 }
 
 // Try with different tenantId header variations